@@ -1,14 +1,28 @@
 import os
-import requests
 import json
-import google.generativeai as genai
+import time
+from collections import deque
 
-def transcribe_audio_file(audio_file):
+
+def warm_up():
     """
-    Transcribe audio file using Hugging Face Whisper API.
+    Import the AI SDKs and audio preprocessing ahead of the first request.
+    
+    These are loaded lazily so processes that only serve public pages never
+    pay for them; call this from a worker's startup to move the cost out of
+    the first voice command instead.
+    """
+    import requests
+    import google.generativeai
+    import audio_processing
+
+def post_audio_to_whisper(audio_data, content_type):
+    """
+    Send raw audio bytes to the Hugging Face Whisper API.
     
     Args:
-        audio_file: Flask FileStorage object containing the audio file
+        audio_data: Audio bytes to transcribe
+        content_type: MIME type of audio_data
         
     Returns:
         str: Transcribed text from the audio
@@ -16,17 +30,12 @@ def transcribe_audio_file(audio_file):
     Raises:
         Exception: If transcription fails or API key is missing
     """
+    import requests
+    
     hf_token = os.environ.get('HF_TOKEN')
     if not hf_token:
         raise Exception('HF_TOKEN environment variable not set')
     
-    audio_data = audio_file.read()
-    
-    if len(audio_data) > 25 * 1024 * 1024:
-        raise Exception('Audio file too large (max 25MB)')
-    
-    content_type = audio_file.mimetype or 'application/octet-stream'
-    
     api_url = "https://api-inference.huggingface.co/models/openai/whisper-base"
     headers = {
         "Authorization": f"Bearer {hf_token}",
@@ -50,92 +59,189 @@ def transcribe_audio_file(audio_file):
         raise Exception(f"Failed to transcribe audio: {str(e)}")
 
 
-def get_intent_from_text(text):
+def transcribe_audio_file(audio_file):
     """
-    Extract structured intent from transcribed text using Google Gemini API.
+    Transcribe audio file using Hugging Face Whisper API.
+    
+    The upload is first downmixed to mono 16 kHz, trimmed of leading and
+    trailing silence and re-encoded as Opus (see audio_processing), so less
+    audio is uploaded and transcribed.
     
     Args:
-        text: Transcribed text from audio
+        audio_file: Flask FileStorage object containing the audio file
         
     Returns:
-        dict: Parsed intent with 'intent' and 'content' fields
-        Example: {"intent": "shop_name", "content": "Meera's Flowers"}
+        str: Transcribed text from the audio
         
     Raises:
-        Exception: If intent extraction fails or API key is missing
+        Exception: If transcription fails or API key is missing
     """
-    print(f"\n=== get_intent_from_text DEBUG ===")
-    print(f"Input text: '{text}'")
+    import audio_processing
     
-    try:
+    if not os.environ.get('HF_TOKEN'):
+        raise Exception('HF_TOKEN environment variable not set')
+    
+    audio_data = audio_file.read()
+    
+    if len(audio_data) > 25 * 1024 * 1024:
+        raise Exception('Audio file too large (max 25MB)')
+    
+    content_type = audio_file.mimetype or 'application/octet-stream'
+    
+    audio_data, content_type = audio_processing.preprocess_audio_in_pool(audio_data, content_type)
+    
+    return post_audio_to_whisper(audio_data, content_type)
+
+
+GEMINI_MODEL = os.environ.get('GEMINI_MODEL', 'gemini-2.0-flash')
+
+VALID_INTENTS = ['shop_name', 'description', 'announcement', 'unknown']
+
+INTENT_PROMPT = (
+    'Classify a voice command that edits a small business website. '
+    'intent: the field to change, or "unknown". '
+    'content: the new value, or "" if unknown.\n'
+    'Command: {text}'
+)
+
+INTENT_RESPONSE_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'intent': {'type': 'STRING', 'format': 'enum', 'enum': VALID_INTENTS},
+        'content': {'type': 'STRING'}
+    },
+    'required': ['intent', 'content']
+}
+
+intent_call_log = deque(maxlen=500)
+
+_intent_model = None
+
+
+def _get_intent_model():
+    """
+    Create the Gemini model used for intent extraction on first use.
+    The model is configured to answer with JSON matching INTENT_RESPONSE_SCHEMA.
+    """
+    global _intent_model
+    if _intent_model is None:
         gemini_api_key = os.environ.get('GEMINI_API_KEY')
         if not gemini_api_key:
             print("ERROR: GEMINI_API_KEY not found in environment")
             raise Exception('GEMINI_API_KEY environment variable not set')
         
-        print("GEMINI_API_KEY found, configuring API...")
+        import google.generativeai as genai
         genai.configure(api_key=gemini_api_key)
-        
-        prompt = f"""You are an AI assistant helping users update their website content through voice commands.
+        _intent_model = genai.GenerativeModel(
+            GEMINI_MODEL,
+            generation_config=genai.GenerationConfig(
+                response_mime_type='application/json',
+                response_schema=INTENT_RESPONSE_SCHEMA,
+                temperature=0
+            )
+        )
+    return _intent_model
 
-The user can update three fields:
-1. "shop_name" - The name of their business/shop
-2. "description" - A description of their business
-3. "announcement" - A special announcement or message
 
-Analyze the following voice command and determine what the user wants to update.
+def _record_intent_call(response, latency_ms, parse_failed, error=None):
+    """
+    Record token usage and latency for one intent extraction call.
+    Token counts are None when the response carries no usage metadata.
+    """
+    usage = getattr(response, 'usage_metadata', None)
+    entry = {
+        'latency_ms': round(latency_ms, 1),
+        'prompt_tokens': getattr(usage, 'prompt_token_count', None),
+        'output_tokens': getattr(usage, 'candidates_token_count', None),
+        'total_tokens': getattr(usage, 'total_token_count', None),
+        'parse_failed': parse_failed,
+        'error': error
+    }
+    intent_call_log.append(entry)
+    print(f"Gemini intent call: {entry}")
+    return entry
 
-User's voice command: "{text}"
 
-Respond ONLY with a JSON object in this exact format (no additional text):
-{{"intent": "field_name", "content": "the value to set"}}
+def get_intent_call_stats():
+    """
+    Summarize recent intent extraction calls.
+    Returns a dictionary with call and error counts, parse failures, average
+    latency and average token usage over the calls that reported usage.
+    """
+    calls = list(intent_call_log)
+    with_usage = [call['total_tokens'] for call in calls if call['total_tokens'] is not None]
+    
+    return {
+        'calls': len(calls),
+        'errors': sum(1 for call in calls if call['error']),
+        'parse_failures': sum(1 for call in calls if call['parse_failed']),
+        'avg_latency_ms': sum(call['latency_ms'] for call in calls) / len(calls) if calls else 0.0,
+        'avg_total_tokens': sum(with_usage) / len(with_usage) if with_usage else None
+    }
 
-Examples:
-- If user says "Change my shop name to Meera's Flowers", respond: {{"intent": "shop_name", "content": "Meera's Flowers"}}
-- If user says "Update my description to We sell fresh organic vegetables", respond: {{"intent": "description", "content": "We sell fresh organic vegetables"}}
-- If user says "Add an announcement that we're open on weekends", respond: {{"intent": "announcement", "content": "We're open on weekends"}}
 
-If you cannot determine the intent, respond: {{"intent": "unknown", "content": ""}}"""
+def get_intent_from_text(text):
+    """
+    Extract structured intent from transcribed text using Google Gemini API.
+    
+    The model runs in structured-output mode, so the response is JSON in a
+    fixed shape and needs no few-shot examples or Markdown cleanup.
+    
+    Args:
+        text: Transcribed text from audio
         
-        print("Calling Gemini API...")
-        model = genai.GenerativeModel('gemini-pro')
-        response = model.generate_content(prompt)
+    Returns:
+        dict: Parsed intent with 'intent' and 'content' fields
+        Example: {"intent": "shop_name", "content": "Meera's Flowers"}
         
-        response_text = response.text.strip()
-        print(f"Raw Gemini response: '{response_text}'")
+    Raises:
+        Exception: If intent extraction fails or API key is missing
+    """
+    print(f"\n=== get_intent_from_text DEBUG ===")
+    print(f"Input text: '{text}'")
+    
+    try:
+        model = _get_intent_model()
         
-        if response_text.startswith('```json'):
-            response_text = response_text.replace('```json', '').replace('```', '').strip()
-        elif response_text.startswith('```'):
-            response_text = response_text.replace('```', '').strip()
+        print("Calling Gemini API...")
+        response = None
+        start = time.perf_counter()
+        try:
+            response = model.generate_content(INTENT_PROMPT.format(text=text))
+            response_text = response.text
+        except Exception as call_err:
+            latency_ms = (time.perf_counter() - start) * 1000
+            _record_intent_call(response, latency_ms, parse_failed=False,
+                                error=f"{type(call_err).__name__}: {call_err}")
+            raise
+        latency_ms = (time.perf_counter() - start) * 1000
         
-        print(f"Cleaned response: '{response_text}'")
+        print(f"Raw Gemini response: '{response_text}'")
         
         try:
             parsed_response = json.loads(response_text)
-            print(f"Parsed JSON: {parsed_response}")
-            
+            if not isinstance(parsed_response, dict):
+                raise ValueError("Response is not a JSON object")
             if 'intent' not in parsed_response or 'content' not in parsed_response:
-                print("ERROR: Response missing required fields")
                 raise ValueError("Response missing required fields")
-            
-            valid_intents = ['shop_name', 'description', 'announcement', 'unknown']
-            if parsed_response['intent'] not in valid_intents:
-                print(f"WARNING: Invalid intent '{parsed_response['intent']}', setting to 'unknown'")
-                parsed_response['intent'] = 'unknown'
-            
-            print(f"Returning parsed response: {parsed_response}")
-            print("=== END get_intent_from_text DEBUG ===\n")
-            return parsed_response
-            
-        except json.JSONDecodeError as json_err:
-            print(f"ERROR: JSON decode failed - {str(json_err)}")
-            print("Returning unknown intent")
+        except (ValueError, TypeError) as parse_err:
+            print(f"ERROR: Could not parse response - {str(parse_err)}")
+            _record_intent_call(response, latency_ms, parse_failed=True)
             print("=== END get_intent_from_text DEBUG ===\n")
             return {
                 "intent": "unknown",
                 "content": ""
             }
+        
+        _record_intent_call(response, latency_ms, parse_failed=False)
+        
+        if parsed_response['intent'] not in VALID_INTENTS:
+            print(f"WARNING: Invalid intent '{parsed_response['intent']}', setting to 'unknown'")
+            parsed_response['intent'] = 'unknown'
+        
+        print(f"Returning parsed response: {parsed_response}")
+        print("=== END get_intent_from_text DEBUG ===\n")
+        return parsed_response
             
     except Exception as e:
         print(f"\n!!! CRITICAL ERROR in get_intent_from_text !!!")
@@ -2,13 +2,24 @@ import os
 from flask import Flask, render_template, request, redirect, url_for, session, jsonify
 from werkzeug.security import check_password_hash
 import database
+import api_helper
 from api_helper import get_user_intent, get_intent_from_text
 
 app = Flask(__name__)
 
 app.secret_key = os.environ.get('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
 
-database.init_db()
+def warm_up():
+    """
+    Create the database tables and load the AI SDKs up front.
+    Both otherwise happen lazily on first use; set VAANI_WARMUP=1 to run
+    this when a worker imports the app.
+    """
+    database.init_db()
+    api_helper.warm_up()
+
+if os.environ.get('VAANI_WARMUP') == '1':
+    warm_up()
 
 @app.route('/')
 def index():
@@ -49,11 +60,11 @@ def login():
         if not username or not password:
             return jsonify({'error': 'Username and password are required'}), 400
         
-        user = database.get_user_by_username(username)
+        user = database.get_user_credentials(username)
         
-        if user and database.verify_password(user['password'], password):
-            session['user_id'] = user['id']
-            session['username'] = user['username']
+        if user and database.verify_password(user.password, password):
+            session['user_id'] = user.id
+            session['username'] = user.username
             return redirect(url_for('dashboard'))
         else:
             return jsonify({'error': 'Invalid username or password'}), 401
@@ -72,11 +83,14 @@ def dashboard():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     
-    user_id = session['user_id']
-    website_data = database.get_website_content(user_id)
+    user, website_data = database.get_user_with_website_by_id(session['user_id'])
+    
+    if not user:
+        session.clear()
+        return redirect(url_for('login'))
     
     return render_template('dashboard.html', 
-                         username=session['username'],
+                         username=user.username,
                          website=website_data)
 
 @app.route('/process-audio', methods=['POST'])
@@ -261,15 +275,12 @@ def save_data():
 @app.route('/public/<username>')
 def public_website(username):
     """Public website route for displaying user's live website."""
-    user = database.get_user_by_username(username)
+    user, website_data = database.get_user_with_website(username)
     
     if not user:
         return render_template('404.html'), 404
     
-    user_id = user['id']
-    website_data = database.get_website_content(user_id)
-    
-    database.increment_website_view(user_id)
+    database.increment_website_view(user.id)
     
     if not website_data:
         website_data = {
@@ -285,4 +296,5 @@ def public_website(username):
                          website=website_data)
 
 if __name__ == '__main__':
+    warm_up()
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,218 @@
+import multiprocessing
+import os
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TARGET_SAMPLE_RATE = 16000
+FRAME_MS = 30
+PADDING_MS = 200
+RELATIVE_THRESHOLD_DB = -35.0
+ABSOLUTE_THRESHOLD_DBFS = -55.0
+OUTPUT_BITRATE = '24k'
+OUTPUT_CONTENT_TYPE = 'audio/ogg'
+PREPROCESS_TIMEOUT_SECONDS = 20
+# Workers stop ffmpeg this long before the caller stops waiting on them.
+WORKER_DEADLINE_MARGIN_SECONDS = 1
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def is_available() -> bool:
+    """Return True if numpy and the ffmpeg binary are both available."""
+    return np is not None and shutil.which('ffmpeg') is not None
+
+
+def _run_ffmpeg(args: list, input_data: bytes, deadline: Optional[float] = None) -> bytes:
+    """
+    Run ffmpeg reading from stdin and writing to stdout.
+    ffmpeg is killed if it is still running at deadline (a time.time() value).
+    """
+    if deadline is None:
+        deadline = time.time() + PREPROCESS_TIMEOUT_SECONDS
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        raise Exception('Audio preprocessing deadline exceeded')
+
+    command = ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-nostdin'] + args
+    process = subprocess.run(
+        command,
+        input=input_data,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        timeout=remaining
+    )
+    if process.returncode != 0:
+        raise Exception(f"ffmpeg failed: {process.stderr.decode(errors='replace').strip()}")
+    return process.stdout
+
+
+def decode_to_pcm(audio_data: bytes, sample_rate: int = TARGET_SAMPLE_RATE,
+                  deadline: Optional[float] = None):
+    """
+    Decode any ffmpeg-readable audio into mono 16-bit PCM.
+    Downmixing and resampling both happen inside ffmpeg.
+    Returns a numpy int16 array.
+    """
+    raw = _run_ffmpeg(
+        ['-i', 'pipe:0', '-ac', '1', '-ar', str(sample_rate), '-f', 's16le', 'pipe:1'],
+        audio_data,
+        deadline
+    )
+    return np.frombuffer(raw, dtype=np.int16)
+
+
+def encode_opus(samples, sample_rate: int = TARGET_SAMPLE_RATE,
+                deadline: Optional[float] = None) -> bytes:
+    """Encode mono int16 PCM samples as Opus in Ogg at a speech bitrate."""
+    return _run_ffmpeg(
+        ['-f', 's16le', '-ar', str(sample_rate), '-ac', '1', '-i', 'pipe:0',
+         '-c:a', 'libopus', '-b:a', OUTPUT_BITRATE, '-application', 'voip',
+         '-f', 'ogg', 'pipe:1'],
+        samples.astype(np.int16).tobytes(),
+        deadline
+    )
+
+
+def trim_silence(samples, sample_rate: int = TARGET_SAMPLE_RATE,
+                 frame_ms: int = FRAME_MS, padding_ms: int = PADDING_MS,
+                 relative_threshold_db: float = RELATIVE_THRESHOLD_DB,
+                 absolute_threshold_dbfs: float = ABSOLUTE_THRESHOLD_DBFS):
+    """
+    Trim leading and trailing silence using frame RMS energy.
+
+    A frame counts as speech when its RMS is above both the absolute floor
+    and a level relative to the loudest frame in the clip. Everything between
+    the first and last speech frame is kept, plus some padding on each side.
+
+    Args:
+        samples: numpy int16 array of mono PCM samples
+
+    Returns:
+        numpy int16 array; empty if no frame is above the threshold
+    """
+    frame_length = sample_rate * frame_ms // 1000
+    frame_count = len(samples) // frame_length
+    if frame_count == 0:
+        return samples
+
+    frames = samples[:frame_count * frame_length].astype(np.float32) / 32768.0
+    frames = frames.reshape(frame_count, frame_length)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+
+    threshold = max(
+        float(rms.max()) * 10 ** (relative_threshold_db / 20),
+        10 ** (absolute_threshold_dbfs / 20)
+    )
+    voiced = np.flatnonzero(rms >= threshold)
+    if voiced.size == 0:
+        return samples[:0]
+
+    padding = sample_rate * padding_ms // 1000
+    start = max(int(voiced[0]) * frame_length - padding, 0)
+    end = min((int(voiced[-1]) + 1) * frame_length + padding, len(samples))
+    return samples[start:end]
+
+
+def preprocess_audio(audio_data: bytes, content_type: str,
+                     deadline: Optional[float] = None) -> Tuple[bytes, str]:
+    """
+    Decode, downmix to mono 16 kHz, trim silence and re-encode as Opus.
+
+    Args:
+        audio_data: Raw bytes uploaded by the browser
+        content_type: MIME type of audio_data
+        deadline: time.time() value after which ffmpeg is stopped
+                  (default: PREPROCESS_TIMEOUT_SECONDS from now)
+
+    Returns:
+        tuple: (audio bytes, content type) to send for transcription.
+        The original input is returned unchanged if preprocessing is
+        unavailable, fails, finds no speech, or would not shrink the upload.
+    """
+    if not is_available():
+        return audio_data, content_type
+
+    try:
+        if deadline is None:
+            deadline = time.time() + PREPROCESS_TIMEOUT_SECONDS
+        samples = decode_to_pcm(audio_data, deadline=deadline)
+        trimmed = trim_silence(samples)
+        if trimmed.size == 0:
+            print("Audio preprocessing: no speech detected, sending original audio")
+            return audio_data, content_type
+
+        encoded = encode_opus(trimmed, deadline=deadline)
+        if len(encoded) >= len(audio_data):
+            return audio_data, content_type
+
+        return encoded, OUTPUT_CONTENT_TYPE
+    except Exception as e:
+        print(f"Audio preprocessing failed, sending original audio: {e}")
+        return audio_data, content_type
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """
+    Create the shared preprocessing worker pool on first use.
+    Workers are started from a forkserver rather than forked from the
+    multi-threaded web server, which could copy a held lock into the child.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            max_workers = int(os.environ.get('AUDIO_WORKERS', '2'))
+            _executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('forkserver')
+            )
+        return _executor
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next call creates a new one."""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def preprocess_audio_in_pool(audio_data: bytes, content_type: str) -> Tuple[bytes, str]:
+    """
+    Run preprocess_audio in the worker pool so decoding and encoding do not
+    hold up the request thread's interpreter.
+
+    The worker is given a deadline just inside the caller's timeout, so it
+    stops ffmpeg before the caller gives up instead of staying busy. Falls
+    back to the original audio if the pool is unavailable or times out; a
+    broken pool is replaced on the next call.
+    """
+    if not is_available():
+        return audio_data, content_type
+
+    deadline = time.time() + PREPROCESS_TIMEOUT_SECONDS - WORKER_DEADLINE_MARGIN_SECONDS
+    executor = _get_executor()
+    future = None
+    try:
+        future = executor.submit(preprocess_audio, audio_data, content_type, deadline)
+        return future.result(timeout=PREPROCESS_TIMEOUT_SECONDS)
+    except BrokenProcessPool as e:
+        print(f"Audio preprocessing pool broke, recreating it on next use: {e}")
+        _discard_executor(executor)
+        return audio_data, content_type
+    except Exception as e:
+        if future is not None:
+            future.cancel()
+        print(f"Audio preprocessing worker failed, sending original audio: {e}")
+        return audio_data, content_type
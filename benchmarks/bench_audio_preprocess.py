@@ -0,0 +1,84 @@
+"""
+Benchmark server-side audio preprocessing.
+
+Reports, for each clip, the upload size before and after preprocessing and
+the preprocessing time. When HF_TOKEN is set, also measures end-to-end
+transcription latency with and without preprocessing.
+
+Pass recorded speech clips, ideally saved from the browser's MediaRecorder.
+Synthetic signals (tones, digital silence) compress unrealistically well and
+make the byte reduction meaningless, so none are generated here.
+
+Usage:
+    python benchmarks/bench_audio_preprocess.py clip1.webm clip2.ogg ...
+"""
+import mimetypes
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import audio_processing
+
+REPEATS = 3
+
+
+def time_call(func, *args):
+    """Return (result of the last call, median seconds over REPEATS calls)."""
+    timings = []
+    result = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return result, statistics.median(timings)
+
+
+def bench_clip(name: str, audio_data: bytes, content_type: str):
+    (processed, processed_type), preprocess_seconds = time_call(
+        audio_processing.preprocess_audio, audio_data, content_type
+    )
+    reduction = 100.0 * (1 - len(processed) / len(audio_data))
+    print(f"{name}")
+    print(f"  bytes:       {len(audio_data):>10,} -> {len(processed):>10,} ({reduction:.1f}% smaller)")
+    print(f"  preprocess:  {preprocess_seconds * 1000:>10.1f} ms ({processed_type})")
+
+    if not os.environ.get('HF_TOKEN'):
+        return
+
+    from api_helper import post_audio_to_whisper
+
+    _, raw_seconds = time_call(post_audio_to_whisper, audio_data, content_type)
+    _, trimmed_seconds = time_call(post_audio_to_whisper, processed, processed_type)
+    end_to_end = preprocess_seconds + trimmed_seconds
+    print(f"  whisper raw: {raw_seconds * 1000:>10.1f} ms")
+    print(f"  preprocessed end-to-end: {end_to_end * 1000:.1f} ms "
+          f"({(end_to_end - raw_seconds) * 1000:+.1f} ms)")
+
+
+def main(paths):
+    if not audio_processing.is_available():
+        print("numpy and ffmpeg are required for audio preprocessing")
+        return 1
+
+    if not paths:
+        print("Pass one or more recorded speech clips (e.g. MediaRecorder .webm uploads).")
+        print("No synthetic input is used: it would misstate the byte reduction.")
+        return 1
+
+    print(f"Results for {len(paths)} recorded clip(s):")
+    for path in paths:
+        with open(path, 'rb') as f:
+            audio_data = f.read()
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        bench_clip(path, audio_data, content_type)
+
+    if not os.environ.get('HF_TOKEN'):
+        print("\nSet HF_TOKEN to also measure end-to-end transcription latency.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,106 @@
+"""
+Benchmark bulk shop import/export throughput.
+
+Imports --shops pre-hashed records into a temporary database, exports them
+again, and reports shops/second and the export's peak Python memory. Password
+hashing is benchmarked separately on --hash-sample passwords (serial vs
+process pool) and extrapolated, since at the default hash cost it dominates
+the import of plain-password records.
+
+Usage:
+    python benchmarks/bench_bulk_shops.py [--shops 100000] [--hash-sample 64]
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.security import generate_password_hash
+
+import bulk_shops
+import database
+
+
+def make_records(count: int, password_hash: str):
+    for i in range(count):
+        yield json.dumps({
+            'username': f'shop{i}',
+            'password_hash': password_hash,
+            'shop_name': f'Shop {i}',
+            'description': 'We sell fresh organic vegetables',
+            'announcement': 'Open on weekends',
+            'image_url': ''
+        }) + '\n'
+
+
+class CountingWriter(io.TextIOBase):
+    """Discards output, counting characters written."""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, text):
+        self.size += len(text)
+        return len(text)
+
+
+def bench_hashing(sample: int, shops: int, workers: int):
+    passwords = [f'password{i}' for i in range(sample)]
+
+    start = time.perf_counter()
+    for password in passwords:
+        generate_password_hash(password)
+    serial = time.perf_counter() - start
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        start = time.perf_counter()
+        list(pool.map(bulk_shops._hash_password, passwords, chunksize=max(1, sample // (workers * 4))))
+        pooled = time.perf_counter() - start
+
+    print(f"hashing:  serial {sample / serial:>9.1f} /s   pool({workers}) {sample / pooled:>9.1f} /s   "
+          f"-> {shops:,} passwords in ~{shops / (sample / pooled):.0f} s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--shops', type=int, default=100000)
+    parser.add_argument('--chunk-size', type=int, default=bulk_shops.DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--hash-sample', type=int, default=64)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DATABASE_NAME = os.path.join(tmp, 'bench.db')
+        password_hash = generate_password_hash('password')
+
+        start = time.perf_counter()
+        stats = bulk_shops.import_shops(make_records(args.shops, password_hash),
+                                        args.chunk_size, args.workers)
+        elapsed = time.perf_counter() - start
+        print(f"import:   {stats['imported']:,} shops in {elapsed:.2f} s "
+              f"({stats['imported'] / elapsed:,.0f} shops/s)")
+
+        writer = CountingWriter()
+        tracemalloc.start()
+        start = time.perf_counter()
+        count = bulk_shops.export_shops(writer)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"export:   {count:,} shops in {elapsed:.2f} s ({count / elapsed:,.0f} shops/s, "
+              f"{writer.size / 1e6:.1f} MB written, peak memory {peak / 1e6:.2f} MB)")
+
+    if args.hash_sample:
+        bench_hashing(args.hash_sample, args.shops, args.workers)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
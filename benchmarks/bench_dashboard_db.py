@@ -0,0 +1,89 @@
+"""
+Micro-benchmark per-request database time for the dashboard and public page.
+
+Compares the old access pattern (get_user_by_username / get_website_content,
+one connection and SELECT * each) with the single JOIN loaders, against a
+temporary database seeded with --users shops.
+
+Usage:
+    python benchmarks/bench_dashboard_db.py [--users 10000] [--requests 5000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+
+def seed(user_count: int):
+    """Insert user_count users, each with a website, in one transaction."""
+    conn = database.get_db_connection()
+    conn.executemany(
+        'INSERT INTO users (id, username, password) VALUES (?, ?, ?)',
+        ((i, f'shop{i}', 'pbkdf2:sha256:600000$salt$hash') for i in range(1, user_count + 1))
+    )
+    conn.executemany(
+        'INSERT INTO websites (user_id, shop_name, description, announcement, image_url) '
+        'VALUES (?, ?, ?, ?, ?)',
+        ((i, f'Shop {i}', 'We sell fresh organic vegetables ' * 4, 'Open on weekends', '')
+         for i in range(1, user_count + 1))
+    )
+    conn.commit()
+    conn.close()
+
+
+def old_dashboard(user_id, username):
+    return database.get_website_content(user_id)
+
+
+def new_dashboard(user_id, username):
+    return database.get_user_with_website_by_id(user_id)
+
+
+def old_public(user_id, username):
+    user = database.get_user_by_username(username)
+    return database.get_website_content(user['id'])
+
+
+def new_public(user_id, username):
+    return database.get_user_with_website(username)
+
+
+def bench(func, keys):
+    start = time.perf_counter()
+    for user_id, username in keys:
+        func(user_id, username)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DATABASE_NAME = os.path.join(tmp, 'bench.db')
+        seed(args.users)
+
+        rng = random.Random(0)
+        keys = [(i, f'shop{i}') for i in
+                (rng.randint(1, args.users) for _ in range(args.requests))]
+
+        for label, old, new in (('dashboard', old_dashboard, new_dashboard),
+                                ('public page', old_public, new_public)):
+            bench(new, keys[:100])
+            old_us = bench(old, keys)
+            new_us = bench(new, keys)
+            print(f"{label:<12} old {old_us:>8.1f} us/request   "
+                  f"new {new_us:>8.1f} us/request   ({old_us / new_us:.2f}x)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Cold-start import budget check for app.py.
+
+Imports the app in a fresh interpreter under `python -X importtime` and
+fails (exit code 1) if its cumulative import time exceeds the budget, or if any
+module that should load lazily was imported at startup.
+
+Usage:
+    python benchmarks/check_import_time.py [--budget-ms 600] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_BUDGET_MS = 600
+
+LAZY_MODULES = [
+    'google.generativeai',
+    'requests',
+    'numpy',
+    'audio_processing',
+]
+
+
+def measure_import(module: str = 'app'):
+    """
+    Import `module` in a fresh interpreter.
+    Returns (total import time in ms, set of imported module names).
+    """
+    env = dict(os.environ)
+    env.pop('VAANI_WARMUP', None)
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    if process.returncode != 0:
+        raise Exception(f"Importing {module} failed:\n{process.stderr}")
+
+    total_us = 0
+    imported = set()
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imported.add(name.strip())
+        # The top-level entry for the module includes everything it pulled
+        # in, but not interpreter startup (site, encodings, ...).
+        if name == f' {module}':
+            total_us = int(cumulative)
+    return total_us / 1000, imported
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget-ms', type=float,
+                        default=float(os.environ.get('IMPORT_BUDGET_MS', DEFAULT_BUDGET_MS)))
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    timings = []
+    imported = set()
+    for _ in range(args.runs):
+        elapsed_ms, imported = measure_import()
+        timings.append(elapsed_ms)
+    median_ms = statistics.median(timings)
+
+    print(f"app import: median {median_ms:.1f} ms over {args.runs} runs "
+          f"(budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    eager = [name for name in LAZY_MODULES if name in imported]
+    if eager:
+        print(f"FAIL: imported at startup but should be lazy: {', '.join(eager)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"FAIL: cold start exceeds budget by {median_ms - args.budget_ms:.1f} ms")
+        failed = True
+
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+Bulk import and export of shops (users with their websites) as NDJSON.
+
+Each line is one JSON object:
+    {"username": "meera", "password": "secret", "shop_name": "Meera's Flowers",
+     "description": "...", "announcement": "...", "image_url": "...", "views": 0}
+
+Import accepts either "password" (hashed here, in a process pool) or an
+already hashed "password_hash", which is what export writes, so an export
+can be re-imported as is; if both are present, "password_hash" is used.
+Existing usernames are skipped, and so are lines with missing or mistyped
+fields.
+
+Usage:
+    python bulk_shops.py import shops.ndjson [--chunk-size 1000] [--workers N]
+    python bulk_shops.py export shops.ndjson
+    (use - for stdin/stdout)
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional
+
+from werkzeug.security import generate_password_hash
+
+import database
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Older SQLite builds allow at most 999 bound parameters per statement.
+MAX_QUERY_PARAMETERS = 900
+
+WEBSITE_FIELDS = ('shop_name', 'description', 'announcement', 'image_url')
+
+_EXPORT_QUERY = '''
+    SELECT u.username, u.password,
+           w.shop_name, w.description, w.announcement, w.image_url, w.views
+    FROM users u
+    LEFT JOIN websites w ON w.user_id = u.id
+    ORDER BY u.id
+'''
+
+
+def _hash_password(password: str) -> str:
+    return generate_password_hash(password)
+
+
+def _validate_record(record: Any) -> None:
+    """Raise ValueError if record is not a usable shop record."""
+    if not isinstance(record, dict):
+        raise ValueError('expected a JSON object')
+    if not record.get('username') or not isinstance(record['username'], str):
+        raise ValueError('username must be a non-empty string')
+    if 'password_hash' in record:
+        if not record['password_hash'] or not isinstance(record['password_hash'], str):
+            raise ValueError('password_hash must be a non-empty string')
+    elif not record.get('password') or not isinstance(record['password'], str):
+        raise ValueError('password or password_hash must be a non-empty string')
+    for field in WEBSITE_FIELDS:
+        if not isinstance(record.get(field), (str, type(None))):
+            raise ValueError(f'{field} must be a string or null')
+    views = record.get('views')
+    if views is not None and (not isinstance(views, int) or isinstance(views, bool)):
+        raise ValueError('views must be an integer or null')
+
+
+def _parse_lines(lines: Iterable[str], stats: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+    """Yield valid shop records, counting and reporting invalid lines."""
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            _validate_record(record)
+        except ValueError as e:
+            print(f"Line {line_number}: skipped invalid record: {e}", file=sys.stderr)
+            stats['invalid'] += 1
+            continue
+        yield record
+
+
+def _chunks(records: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _new_records(cursor, chunk: List[Dict[str, Any]], stats: Dict[str, int]) -> List[Dict[str, Any]]:
+    """Drop records whose username exists in the database or earlier in the chunk."""
+    usernames = [record['username'] for record in chunk]
+    seen = set()
+    for start in range(0, len(usernames), MAX_QUERY_PARAMETERS):
+        batch = usernames[start:start + MAX_QUERY_PARAMETERS]
+        placeholders = ', '.join('?' * len(batch))
+        cursor.execute(f'SELECT username FROM users WHERE username IN ({placeholders})', batch)
+        seen.update(row[0] for row in cursor.fetchall())
+
+    fresh = []
+    for record in chunk:
+        if record['username'] in seen:
+            stats['skipped_existing'] += 1
+            continue
+        seen.add(record['username'])
+        fresh.append(record)
+    return fresh
+
+
+def _insert_chunk(conn, cursor, records: List[Dict[str, Any]]) -> None:
+    """Insert users and their websites for one chunk in a single transaction."""
+    with conn:
+        cursor.executemany(
+            'INSERT INTO users (username, password) VALUES (?, ?)',
+            [(record['username'], record['password_hash']) for record in records]
+        )
+        cursor.executemany(
+            '''INSERT INTO websites
+                   (user_id, shop_name, description, announcement, image_url, views)
+               SELECT id, ?, ?, ?, ?, ? FROM users WHERE username = ?''',
+            [tuple(record.get(field) for field in WEBSITE_FIELDS)
+             + (record.get('views') or 0, record['username'])
+             for record in records]
+        )
+
+
+def import_shops(lines: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Import shops from NDJSON lines.
+
+    Records are read lazily and inserted chunk_size at a time, each chunk in
+    a single transaction using executemany. Plain passwords are hashed in a
+    process pool.
+
+    Args:
+        lines: Iterable of NDJSON lines, e.g. an open file
+        chunk_size: Number of records per transaction
+        workers: Process pool size for password hashing (default: CPU count)
+
+    Returns:
+        dict: Counts of 'imported', 'skipped_existing' and 'invalid' records
+    """
+    stats = {'imported': 0, 'skipped_existing': 0, 'invalid': 0}
+    workers = workers or os.cpu_count() or 1
+    conn = database.get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk in _chunks(_parse_lines(lines, stats), chunk_size):
+                records = _new_records(cursor, chunk, stats)
+                if not records:
+                    continue
+
+                plain = [record for record in records if 'password_hash' not in record]
+                pool_chunk_size = max(1, len(plain) // (workers * 4))
+                hashes = pool.map(_hash_password,
+                                  [record['password'] for record in plain],
+                                  chunksize=pool_chunk_size)
+                for record, password_hash in zip(plain, hashes):
+                    record['password_hash'] = password_hash
+
+                while records:
+                    try:
+                        _insert_chunk(conn, cursor, records)
+                    except sqlite3.IntegrityError:
+                        # A username was registered (e.g. via /register) after
+                        # the existence check; the chunk was rolled back, so
+                        # drop the newly taken usernames and retry.
+                        remaining = _new_records(cursor, records, stats)
+                        if len(remaining) == len(records):
+                            raise
+                        records = remaining
+                        continue
+                    stats['imported'] += len(records)
+                    break
+    finally:
+        conn.close()
+
+    return stats
+
+
+def export_shops(out: IO[str], batch_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Write every shop to out as NDJSON, in user ID order.
+
+    Rows are streamed from the cursor batch_size at a time, so memory use
+    does not grow with the number of shops. Passwords are written as
+    'password_hash'.
+
+    Returns:
+        int: Number of shops exported
+    """
+    conn = database.get_db_connection()
+    cursor = conn.cursor()
+    count = 0
+
+    try:
+        cursor.execute(_EXPORT_QUERY)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                record = {'username': row[0], 'password_hash': row[1]}
+                record.update(zip(WEBSITE_FIELDS, row[2:6]))
+                record['views'] = row[6] or 0
+                out.write(json.dumps(record, ensure_ascii=False))
+                out.write('\n')
+            count += len(rows)
+    finally:
+        conn.close()
+
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bulk import/export shops as NDJSON.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help='import shops from NDJSON')
+    import_parser.add_argument('path', help='NDJSON file, or - for stdin')
+    import_parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    import_parser.add_argument('--workers', type=int, default=None)
+
+    export_parser = subparsers.add_parser('export', help='export shops to NDJSON')
+    export_parser.add_argument('path', help='NDJSON file, or - for stdout')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'import':
+        if args.path == '-':
+            stats = import_shops(sys.stdin, args.chunk_size, args.workers)
+        else:
+            with open(args.path, encoding='utf-8') as f:
+                stats = import_shops(f, args.chunk_size, args.workers)
+        print(f"Imported {stats['imported']} shops "
+              f"({stats['skipped_existing']} existing skipped, {stats['invalid']} invalid)",
+              file=sys.stderr)
+        return 1 if stats['invalid'] else 0
+
+    if args.path == '-':
+        count = export_shops(sys.stdout)
+    else:
+        with open(args.path, 'w', encoding='utf-8') as f:
+            count = export_shops(f)
+    print(f"Exported {count} shops", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
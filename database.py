@@ -1,18 +1,30 @@
 import sqlite3
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from werkzeug.security import generate_password_hash, check_password_hash
 
 DATABASE_NAME = 'vaani.db'
 
-def get_db_connection():
-    """Create and return a database connection."""
+_initialized_path = None
+
+def _connect():
+    """Open a raw connection without checking the schema."""
     conn = sqlite3.connect(DATABASE_NAME)
     conn.row_factory = sqlite3.Row
     return conn
 
+def get_db_connection():
+    """
+    Create and return a database connection.
+    Creates the tables on the first call for each DATABASE_NAME in a process.
+    """
+    if _initialized_path != DATABASE_NAME:
+        init_db()
+    return _connect()
+
 def init_db():
     """Initialize the database with required tables."""
-    conn = get_db_connection()
+    global _initialized_path
+    conn = _connect()
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -38,6 +50,89 @@ def init_db():
     
     conn.commit()
     conn.close()
+    _initialized_path = DATABASE_NAME
+
+class UserRow:
+    """Lightweight user row. password is None unless the query selected it."""
+    __slots__ = ('id', 'username', 'password')
+
+    def __init__(self, id: int, username: str, password: Optional[str] = None):
+        self.id = id
+        self.username = username
+        self.password = password
+
+
+class WebsiteRow:
+    """Lightweight website row."""
+    __slots__ = ('shop_name', 'description', 'announcement', 'image_url', 'views')
+
+    def __init__(self, shop_name: Optional[str], description: Optional[str],
+                 announcement: Optional[str], image_url: Optional[str], views: int):
+        self.shop_name = shop_name
+        self.description = description
+        self.announcement = announcement
+        self.image_url = image_url
+        self.views = views
+
+
+_USER_WITH_WEBSITE_COLUMNS = '''
+    SELECT u.id, u.username,
+           w.user_id, w.shop_name, w.description, w.announcement, w.image_url, w.views
+    FROM users u
+    LEFT JOIN websites w ON w.user_id = u.id
+'''
+
+_USER_WITH_WEBSITE_BY_USERNAME = _USER_WITH_WEBSITE_COLUMNS + 'WHERE u.username = ? LIMIT 1'
+
+_USER_WITH_WEBSITE_BY_ID = _USER_WITH_WEBSITE_COLUMNS + 'WHERE u.id = ? LIMIT 1'
+
+def _load_user_with_website(query: str, value: Any) -> Tuple[Optional[UserRow], Optional[WebsiteRow]]:
+    """Fetch a user and their website with a single JOIN query."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(query, (value,))
+    row = cursor.fetchone()
+
+    conn.close()
+
+    if row is None:
+        return None, None
+
+    user = UserRow(row[0], row[1])
+    website = WebsiteRow(*row[3:]) if row[2] is not None else None
+    return user, website
+
+def get_user_with_website(username: str) -> Tuple[Optional[UserRow], Optional[WebsiteRow]]:
+    """
+    Retrieve a user and their website by username in one query.
+    Returns (user, website); either is None if not found.
+    """
+    return _load_user_with_website(_USER_WITH_WEBSITE_BY_USERNAME, username)
+
+def get_user_with_website_by_id(user_id: int) -> Tuple[Optional[UserRow], Optional[WebsiteRow]]:
+    """
+    Retrieve a user and their website by user ID in one query.
+    Returns (user, website); either is None if not found.
+    """
+    return _load_user_with_website(_USER_WITH_WEBSITE_BY_ID, user_id)
+
+def get_user_credentials(username: str) -> Optional[UserRow]:
+    """
+    Retrieve the id, username and password hash needed to log a user in.
+    Returns a UserRow or None if not found.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute('SELECT id, username, password FROM users WHERE username = ?', (username,))
+    row = cursor.fetchone()
+
+    conn.close()
+
+    if row:
+        return UserRow(row[0], row[1], row[2])
+    return None
 
 def create_user(username: str, password: str) -> Optional[int]:
     """
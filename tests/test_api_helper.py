@@ -0,0 +1,189 @@
+"""
+Tests for Gemini intent extraction in api_helper, against a stubbed
+google.generativeai backend.
+"""
+import json
+import sys
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+import api_helper
+
+
+class StubGenerationConfig:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+class StubGenerativeModel:
+    """Records how it was built and replays queued replies in order."""
+    instances = []
+
+    def __init__(self, model_name, generation_config=None):
+        self.model_name = model_name
+        self.generation_config = generation_config
+        self.prompts = []
+        self.replies = []
+        StubGenerativeModel.instances.append(self)
+
+    def generate_content(self, prompt):
+        self.prompts.append(prompt)
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+class BlockedResponse:
+    """A response whose text accessor raises, like a safety-blocked reply."""
+    usage_metadata = SimpleNamespace(prompt_token_count=30, candidates_token_count=0,
+                                     total_token_count=30)
+
+    @property
+    def text(self):
+        raise ValueError('response was blocked')
+
+
+def reply(text, total_tokens=40):
+    usage = SimpleNamespace(prompt_token_count=total_tokens - 10,
+                            candidates_token_count=10,
+                            total_token_count=total_tokens)
+    return SimpleNamespace(text=text, usage_metadata=usage)
+
+
+@pytest.fixture
+def genai(monkeypatch):
+    module = ModuleType('google.generativeai')
+    module.configured = {}
+    module.configure = lambda **kwargs: module.configured.update(kwargs)
+    module.GenerationConfig = StubGenerationConfig
+    module.GenerativeModel = StubGenerativeModel
+    google = ModuleType('google')
+    google.generativeai = module
+
+    monkeypatch.setitem(sys.modules, 'google', google)
+    monkeypatch.setitem(sys.modules, 'google.generativeai', module)
+    monkeypatch.setenv('GEMINI_API_KEY', 'test-key')
+    monkeypatch.setattr(api_helper, '_intent_model', None)
+    monkeypatch.setattr(api_helper, 'intent_call_log', api_helper.deque(maxlen=500))
+    StubGenerativeModel.instances = []
+    return module
+
+
+def queue(*replies):
+    model = api_helper._get_intent_model()
+    model.replies.extend(replies)
+    return model
+
+
+def test_model_uses_structured_output_config(genai):
+    model = api_helper._get_intent_model()
+
+    assert genai.configured == {'api_key': 'test-key'}
+    assert model.model_name == api_helper.GEMINI_MODEL
+    config = model.generation_config.kwargs
+    assert config['response_mime_type'] == 'application/json'
+    assert config['response_schema'] is api_helper.INTENT_RESPONSE_SCHEMA
+    assert api_helper.INTENT_RESPONSE_SCHEMA['properties']['intent']['enum'] == api_helper.VALID_INTENTS
+    assert api_helper.INTENT_RESPONSE_SCHEMA['required'] == ['intent', 'content']
+
+
+def test_model_is_built_once(genai):
+    queue(reply('{"intent": "unknown", "content": ""}'),
+          reply('{"intent": "unknown", "content": ""}'))
+
+    api_helper.get_intent_from_text('hello')
+    api_helper.get_intent_from_text('hello again')
+
+    assert len(StubGenerativeModel.instances) == 1
+
+
+def test_missing_api_key_raises(genai, monkeypatch):
+    monkeypatch.delenv('GEMINI_API_KEY')
+
+    with pytest.raises(Exception, match='GEMINI_API_KEY'):
+        api_helper.get_intent_from_text('Change my shop name to Bloom')
+
+
+@pytest.mark.parametrize('text', [
+    '{"intent": "shop_name", "content": "Café Ñandú"}',
+    '{\n  "intent": "shop_name",\n  "content": "Caf\\u00e9 \\u00d1and\\u00fa"\n}\n',
+])
+def test_structured_reply_is_parsed(genai, text):
+    model = queue(reply(text))
+
+    result = api_helper.get_intent_from_text('Rename the shop to Café Ñandú')
+
+    assert result == {'intent': 'shop_name', 'content': 'Café Ñandú'}
+    assert model.prompts == [api_helper.INTENT_PROMPT.format(text='Rename the shop to Café Ñandú')]
+    entry = api_helper.intent_call_log[-1]
+    assert entry['parse_failed'] is False
+    assert entry['error'] is None
+    assert entry['total_tokens'] == 40
+
+
+@pytest.mark.parametrize('text', [
+    'not json',
+    '```json\n{"intent": "shop_name", "content": "Bloom"}\n```',
+    '["shop_name", "Bloom"]',
+    '{"intent": "shop_name"}',
+    '',
+])
+def test_malformed_reply_logs_parse_failure(genai, text):
+    queue(reply(text))
+
+    result = api_helper.get_intent_from_text('Change my shop name to Bloom')
+
+    assert result == {'intent': 'unknown', 'content': ''}
+    assert api_helper.intent_call_log[-1]['parse_failed'] is True
+    assert api_helper.get_intent_call_stats()['parse_failures'] == 1
+
+
+def test_unexpected_intent_becomes_unknown(genai):
+    queue(reply(json.dumps({'intent': 'price', 'content': '10'})))
+
+    result = api_helper.get_intent_from_text('Set the price to 10')
+
+    assert result == {'intent': 'unknown', 'content': '10'}
+    assert api_helper.intent_call_log[-1]['parse_failed'] is False
+
+
+def test_backend_error_is_recorded(genai):
+    queue(RuntimeError('quota exceeded'))
+
+    with pytest.raises(Exception, match='quota exceeded'):
+        api_helper.get_intent_from_text('Change my shop name to Bloom')
+
+    entry = api_helper.intent_call_log[-1]
+    assert entry['error'] == 'RuntimeError: quota exceeded'
+    assert entry['latency_ms'] >= 0
+    assert entry['total_tokens'] is None
+
+
+def test_blocked_response_is_recorded(genai):
+    queue(BlockedResponse())
+
+    with pytest.raises(Exception, match='blocked'):
+        api_helper.get_intent_from_text('Change my shop name to Bloom')
+
+    entry = api_helper.intent_call_log[-1]
+    assert entry['error'] == 'ValueError: response was blocked'
+    assert entry['total_tokens'] == 30
+
+
+def test_calls_without_usage_are_left_out_of_token_average(genai):
+    queue(reply('{"intent": "unknown", "content": ""}', total_tokens=40),
+          SimpleNamespace(text='{"intent": "unknown", "content": ""}'),
+          RuntimeError('timeout'))
+
+    api_helper.get_intent_from_text('hello')
+    api_helper.get_intent_from_text('hello')
+    with pytest.raises(Exception):
+        api_helper.get_intent_from_text('hello')
+
+    stats = api_helper.get_intent_call_stats()
+    assert stats['calls'] == 3
+    assert stats['errors'] == 1
+    assert stats['parse_failures'] == 0
+    assert stats['avg_total_tokens'] == 40
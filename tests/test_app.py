@@ -0,0 +1,56 @@
+"""
+Tests for the login and dashboard routes.
+"""
+import pytest
+
+import app as vaani
+import database
+
+
+@pytest.fixture(autouse=True)
+def temp_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DATABASE_NAME', str(tmp_path / 'test.db'))
+
+
+@pytest.fixture
+def client():
+    vaani.app.config['TESTING'] = True
+    return vaani.app.test_client()
+
+
+def test_login_sets_session(client):
+    user_id = database.create_user('meera', 'secret')
+
+    response = client.post('/login', data={'username': 'meera', 'password': 'secret'})
+
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith('/dashboard')
+    with client.session_transaction() as session:
+        assert session['user_id'] == user_id
+        assert session['username'] == 'meera'
+
+
+def test_login_rejects_wrong_password(client):
+    database.create_user('meera', 'secret')
+
+    response = client.post('/login', data={'username': 'meera', 'password': 'wrong'})
+
+    assert response.status_code == 401
+    with client.session_transaction() as session:
+        assert 'user_id' not in session
+
+
+def test_dashboard_clears_session_for_deleted_user(client):
+    user_id = database.create_user('meera', 'secret')
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
+        session['username'] = 'meera'
+    database.delete_user(user_id)
+
+    response = client.get('/dashboard')
+
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith('/login')
+    with client.session_transaction() as session:
+        assert 'user_id' not in session
+        assert 'username' not in session
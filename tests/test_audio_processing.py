@@ -0,0 +1,203 @@
+"""
+Tests for audio preprocessing. ffmpeg is stubbed out except in the last
+test, which runs the real pool and is skipped when ffmpeg is not on PATH.
+"""
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+
+import audio_processing
+
+RATE = audio_processing.TARGET_SAMPLE_RATE
+FRAME = RATE * audio_processing.FRAME_MS // 1000
+PADDING = RATE * audio_processing.PADDING_MS // 1000
+
+
+def tone(seconds, amplitude=0.3):
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (amplitude * 32767 * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+
+
+def silence(seconds):
+    return np.zeros(int(RATE * seconds), dtype=np.int16)
+
+
+def noise(seconds, dbfs):
+    rng = np.random.default_rng(0)
+    rms = 32768 * 10 ** (dbfs / 20)
+    return (rng.standard_normal(int(RATE * seconds)) * rms).astype(np.int16)
+
+
+def test_trim_keeps_speech_plus_padding():
+    samples = np.concatenate([silence(1), tone(1), silence(1)])
+
+    trimmed = audio_processing.trim_silence(samples)
+
+    # The frames straddling the tone's edges count as speech.
+    start = (RATE // FRAME) * FRAME - PADDING
+    end = (2 * RATE // FRAME + 1) * FRAME + PADDING
+    assert (start, end) == (12640, 35360)
+    np.testing.assert_array_equal(trimmed, samples[start:end])
+
+
+def test_trim_padding_is_clamped_to_clip():
+    samples = np.concatenate([tone(0.05), silence(1), tone(0.05)])
+
+    trimmed = audio_processing.trim_silence(samples)
+
+    np.testing.assert_array_equal(trimmed, samples)
+
+
+def test_trim_ignores_noise_relative_to_speech():
+    samples = np.concatenate([noise(1, -50), tone(1), noise(1, -50)])
+
+    trimmed = audio_processing.trim_silence(samples)
+
+    assert len(trimmed) == 22720
+
+
+def test_clip_shorter_than_one_frame_is_unchanged():
+    samples = tone(0.01)
+    assert len(samples) < FRAME
+
+    assert audio_processing.trim_silence(samples) is samples
+
+
+@pytest.mark.parametrize('samples', [silence(2), noise(2, -56)], ids=['zeros', 'noise-56dBFS'])
+def test_all_silence_trims_to_empty(samples):
+    assert audio_processing.trim_silence(samples).size == 0
+
+
+class FakeFfmpeg:
+    """Decodes to the given PCM and encodes to a fixed byte string."""
+
+    def __init__(self, pcm, encoded=b'opus', fail=False):
+        self.pcm = pcm
+        self.encoded = encoded
+        self.fail = fail
+        self.calls = []
+
+    def __call__(self, args, input_data, deadline=None):
+        self.calls.append((args, deadline))
+        if self.fail:
+            raise Exception('ffmpeg failed: invalid data')
+        if '-c:a' in args:
+            return self.encoded
+        return self.pcm.tobytes()
+
+
+@pytest.fixture
+def ffmpeg(monkeypatch):
+    monkeypatch.setattr(audio_processing, 'is_available', lambda: True)
+
+    def install(fake):
+        monkeypatch.setattr(audio_processing, '_run_ffmpeg', fake)
+        return fake
+    return install
+
+
+UPLOAD = b'\x1a\x45\xdf\xa3' + b'\x00' * 5000
+
+
+def test_preprocess_returns_encoded_audio(ffmpeg):
+    fake = ffmpeg(FakeFfmpeg(np.concatenate([silence(1), tone(1), silence(1)])))
+
+    result = audio_processing.preprocess_audio(UPLOAD, 'audio/webm', deadline=123.0)
+
+    assert result == (b'opus', 'audio/ogg')
+    assert [deadline for _, deadline in fake.calls] == [123.0, 123.0]
+    encode_args = fake.calls[1][0]
+    assert encode_args[encode_args.index('-b:a') + 1] == audio_processing.OUTPUT_BITRATE
+
+
+def test_preprocess_falls_back_when_unavailable(monkeypatch):
+    monkeypatch.setattr(audio_processing, 'is_available', lambda: False)
+
+    def unexpected(*args, **kwargs):
+        raise AssertionError('ffmpeg should not run')
+    monkeypatch.setattr(audio_processing, '_run_ffmpeg', unexpected)
+
+    assert audio_processing.preprocess_audio(UPLOAD, 'audio/webm') == (UPLOAD, 'audio/webm')
+
+
+def test_preprocess_falls_back_when_ffmpeg_fails(ffmpeg):
+    ffmpeg(FakeFfmpeg(tone(1), fail=True))
+
+    assert audio_processing.preprocess_audio(UPLOAD, 'audio/webm') == (UPLOAD, 'audio/webm')
+
+
+def test_preprocess_falls_back_when_not_smaller(ffmpeg):
+    ffmpeg(FakeFfmpeg(tone(1), encoded=b'x' * len(UPLOAD)))
+
+    assert audio_processing.preprocess_audio(UPLOAD, 'audio/webm') == (UPLOAD, 'audio/webm')
+
+
+def test_preprocess_falls_back_when_no_speech(ffmpeg):
+    fake = ffmpeg(FakeFfmpeg(silence(2)))
+
+    assert audio_processing.preprocess_audio(UPLOAD, 'audio/webm') == (UPLOAD, 'audio/webm')
+    assert len(fake.calls) == 1
+
+
+@pytest.fixture
+def fresh_executor(monkeypatch):
+    monkeypatch.setattr(audio_processing, '_executor', None)
+    yield
+    if audio_processing._executor is not None:
+        audio_processing._executor.shutdown(wait=False)
+
+
+def test_executor_is_created_once_across_threads(fresh_executor):
+    executors = []
+    barrier = threading.Barrier(8)
+
+    def get():
+        barrier.wait()
+        executors.append(audio_processing._get_executor())
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(executor) for executor in executors}) == 1
+    assert executors[0]._mp_context.get_start_method() == 'forkserver'
+
+
+def test_broken_pool_is_replaced(fresh_executor, monkeypatch):
+    class BrokenExecutor:
+        def submit(self, *args):
+            raise BrokenProcessPool('worker died')
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            pass
+
+    broken = BrokenExecutor()
+    monkeypatch.setattr(audio_processing, 'is_available', lambda: True)
+    monkeypatch.setattr(audio_processing, '_executor', broken)
+
+    result = audio_processing.preprocess_audio_in_pool(UPLOAD, 'audio/webm')
+
+    assert result == (UPLOAD, 'audio/webm')
+    assert audio_processing._executor is None
+    assert audio_processing._get_executor() is not broken
+
+
+@pytest.mark.skipif(audio_processing.shutil.which('ffmpeg') is None, reason='ffmpeg not installed')
+def test_pool_preprocesses_real_audio(fresh_executor):
+    stereo = np.repeat(np.concatenate([silence(2), tone(1), silence(2)])[:, None], 2, axis=1)
+    upload = audio_processing._run_ffmpeg(
+        ['-f', 's16le', '-ar', str(RATE), '-ac', '2', '-i', 'pipe:0',
+         '-c:a', 'pcm_s16le', '-ar', '48000', '-f', 'wav', 'pipe:1'],
+        stereo.tobytes()
+    )
+
+    audio, content_type = audio_processing.preprocess_audio_in_pool(upload, 'audio/wav')
+
+    assert content_type == 'audio/ogg'
+    assert len(audio) < len(upload)
+    decoded = audio_processing.decode_to_pcm(audio)
+    assert abs(len(decoded) - 22720) < RATE // 10
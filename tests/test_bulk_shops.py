@@ -0,0 +1,130 @@
+"""
+Tests for bulk NDJSON shop import/export.
+"""
+import io
+import json
+import sqlite3
+
+import pytest
+
+import bulk_shops
+import database
+
+
+@pytest.fixture(autouse=True)
+def temp_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DATABASE_NAME', str(tmp_path / 'test.db'))
+
+
+def ndjson(*records):
+    return [json.dumps(record) + '\n' for record in records]
+
+
+def stored_password(username):
+    user = database.get_user_credentials(username)
+    return user.password if user else None
+
+
+def test_import_hashes_passwords_and_creates_websites():
+    stats = bulk_shops.import_shops(ndjson(
+        {'username': 'meera', 'password': 'secret', 'shop_name': "Meera's Flowers", 'views': 3},
+        {'username': 'ravi', 'password_hash': 'pbkdf2:sha256:1$salt$hash'}
+    ), workers=1)
+
+    assert stats == {'imported': 2, 'skipped_existing': 0, 'invalid': 0}
+    assert database.verify_password(stored_password('meera'), 'secret')
+    assert stored_password('ravi') == 'pbkdf2:sha256:1$salt$hash'
+    user, website = database.get_user_with_website('meera')
+    assert website.shop_name == "Meera's Flowers"
+    assert website.views == 3
+
+
+@pytest.mark.parametrize('record', [
+    {'username': 'c', 'password': 'x', 'password_hash': 5},
+    {'username': 'c', 'password': 'x', 'password_hash': ''},
+    {'username': 'c', 'password': 5},
+    {'username': 'c'},
+    {'username': '', 'password': 'x'},
+    {'username': 7, 'password': 'x'},
+    {'username': 'c', 'password': 'x', 'shop_name': {'x': 1}},
+    {'username': 'c', 'password': 'x', 'image_url': 3},
+    {'username': 'c', 'password': 'x', 'views': [1]},
+    {'username': 'c', 'password': 'x', 'views': '3'},
+    {'username': 'c', 'password': 'x', 'views': True},
+    ['c', 'x'],
+])
+def test_invalid_records_are_skipped(record):
+    lines = ndjson({'username': 'a', 'password': 'x'}, record, {'username': 'b', 'password': 'y'})
+
+    stats = bulk_shops.import_shops(lines, chunk_size=1, workers=1)
+
+    assert stats == {'imported': 2, 'skipped_existing': 0, 'invalid': 1}
+    assert stored_password('c') is None
+
+
+def test_existing_and_duplicate_usernames_are_skipped():
+    database.create_user('taken', 'pw')
+
+    stats = bulk_shops.import_shops(ndjson(
+        {'username': 'taken', 'password': 'x'},
+        {'username': 'new', 'password': 'x'},
+        {'username': 'new', 'password': 'y'}
+    ), workers=1)
+
+    assert stats == {'imported': 1, 'skipped_existing': 2, 'invalid': 0}
+    assert database.verify_password(stored_password('new'), 'x')
+
+
+def test_username_registered_during_import_is_skipped(monkeypatch):
+    insert_chunk = bulk_shops._insert_chunk
+    calls = []
+
+    def register_then_insert(conn, cursor, records):
+        if not calls:
+            other = sqlite3.connect(database.DATABASE_NAME)
+            other.execute("INSERT INTO users (username, password) VALUES ('racer', 'h')")
+            other.commit()
+            other.close()
+        calls.append(len(records))
+        insert_chunk(conn, cursor, records)
+
+    monkeypatch.setattr(bulk_shops, '_insert_chunk', register_then_insert)
+
+    stats = bulk_shops.import_shops(ndjson(
+        {'username': 'racer', 'password': 'x'},
+        {'username': 'other', 'password': 'y'}
+    ), workers=1)
+
+    assert calls == [2, 1]
+    assert stats == {'imported': 1, 'skipped_existing': 1, 'invalid': 0}
+    assert stored_password('racer') == 'h'
+    assert database.get_user_with_website('other')[1] is not None
+
+
+def test_invalid_lines_are_reported_on_stderr(capsys):
+    bulk_shops.import_shops(['not json\n'] + ndjson({'username': 'a', 'password': 'x'}), workers=1)
+
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert 'Line 1: skipped invalid record' in captured.err
+
+
+def test_export_round_trips_through_import(tmp_path, monkeypatch):
+    bulk_shops.import_shops(ndjson(
+        {'username': 'meera', 'password': 'secret', 'shop_name': 'Bloom', 'views': 2},
+        {'username': 'ravi', 'password': 'pw'}
+    ), workers=1)
+    exported = io.StringIO()
+
+    assert bulk_shops.export_shops(exported, batch_size=1) == 2
+
+    records = [json.loads(line) for line in exported.getvalue().splitlines()]
+    assert [record['username'] for record in records] == ['meera', 'ravi']
+    assert records[0]['shop_name'] == 'Bloom'
+    assert records[0]['views'] == 2
+
+    monkeypatch.setattr(database, 'DATABASE_NAME', str(tmp_path / 'copy.db'))
+    stats = bulk_shops.import_shops(exported.getvalue().splitlines(), workers=1)
+
+    assert stats == {'imported': 2, 'skipped_existing': 0, 'invalid': 0}
+    assert database.verify_password(stored_password('meera'), 'secret')
@@ -0,0 +1,66 @@
+"""
+Tests for the single-query user/website loaders in database.py.
+"""
+import pytest
+
+import database
+
+
+@pytest.fixture(autouse=True)
+def temp_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DATABASE_NAME', str(tmp_path / 'test.db'))
+
+
+def test_user_with_website_by_username_and_id():
+    user_id = database.create_user('meera', 'secret')
+    database.create_website_entry(user_id)
+    database.save_website_content(user_id, shop_name="Meera's Flowers", description='Fresh daily')
+    database.increment_website_view(user_id)
+
+    for user, website in (database.get_user_with_website('meera'),
+                          database.get_user_with_website_by_id(user_id)):
+        assert (user.id, user.username, user.password) == (user_id, 'meera', None)
+        assert website.shop_name == "Meera's Flowers"
+        assert website.description == 'Fresh daily'
+        assert website.announcement is None
+        assert website.views == 1
+
+
+def test_user_without_website_returns_none_website():
+    user_id = database.create_user('ravi', 'pw')
+
+    user, website = database.get_user_with_website('ravi')
+
+    assert user.id == user_id
+    assert website is None
+    assert database.get_user_with_website_by_id(user_id)[1] is None
+
+
+def test_missing_user_returns_none_pair():
+    assert database.get_user_with_website('nobody') == (None, None)
+    assert database.get_user_with_website_by_id(999) == (None, None)
+
+
+def test_username_is_matched_as_a_value():
+    database.create_user('meera', 'secret')
+
+    assert database.get_user_with_website("meera' OR '1'='1") == (None, None)
+
+
+def test_get_user_credentials_returns_password_hash():
+    user_id = database.create_user('meera', 'secret')
+
+    user = database.get_user_credentials('meera')
+
+    assert (user.id, user.username) == (user_id, 'meera')
+    assert user.password != 'secret'
+    assert database.verify_password(user.password, 'secret')
+    assert database.get_user_credentials('nobody') is None
+
+
+def test_rows_use_slots():
+    database.create_user('meera', 'secret')
+    user, _ = database.get_user_with_website('meera')
+
+    with pytest.raises(AttributeError):
+        user.extra = 1
@@ -0,0 +1,39 @@
+"""
+Cold-start budget for importing app.py, using benchmarks/check_import_time.py.
+"""
+import importlib.util
+import os
+import statistics
+
+import pytest
+
+pytest.importorskip('flask')
+
+_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'benchmarks', 'check_import_time.py')
+_spec = importlib.util.spec_from_file_location('check_import_time', _SCRIPT)
+check_import_time = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(check_import_time)
+
+RUNS = 3
+
+
+@pytest.fixture(scope='module')
+def measurements():
+    return [check_import_time.measure_import() for _ in range(RUNS)]
+
+
+def test_app_does_not_import_lazy_modules(measurements):
+    _, imported = measurements[-1]
+
+    assert 'app' in imported
+    eager = [name for name in check_import_time.LAZY_MODULES if name in imported]
+    assert eager == []
+
+
+def test_app_import_is_within_budget(measurements):
+    budget_ms = float(os.environ.get('IMPORT_BUDGET_MS', check_import_time.DEFAULT_BUDGET_MS))
+
+    median_ms = statistics.median(elapsed_ms for elapsed_ms, _ in measurements)
+
+    assert 0 < median_ms <= budget_ms